@@ -0,0 +1,17 @@
+# gunicorn_conf.py – Production server config
+# Run with: gunicorn -c gunicorn_conf.py src.main:app
+import os
+from dotenv import load_dotenv
+
+# Load the same env file as src/config/env.py so PORT from it applies to binding
+env_file = ".env.production" if os.getenv("NODE_ENV") == "production" else ".env.development"
+load_dotenv(dotenv_path=env_file)
+
+# Bind to the same port the app reports (matches env.PORT default)
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# One worker per core so CPU-bound pipeline work scales across processes
+workers = max(2, os.cpu_count() or 1)
+
+# Uvicorn worker auto-selects uvloop + httptools (installed via uvicorn[standard])
+worker_class = "uvicorn.workers.UvicornWorker"
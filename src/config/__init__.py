@@ -1,6 +1,6 @@
 # config/__init__.py
 from .env import env
 from .db import connect_db, MongoDB
-from .supabase import supabase_admin
+from .supabase import supabase_admin, supabase_db
 
-__all__ = ['env', 'connect_db', 'MongoDB', 'supabase_admin']
+__all__ = ['env', 'connect_db', 'MongoDB', 'supabase_admin', 'supabase_db']
@@ -1,43 +1,64 @@
 # config/db.py
-from pymongo import MongoClient
-from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from src.config.env import env
+import asyncio
 import sys
 
+# Guards against concurrent connect() calls racing during startup
+_connect_lock = asyncio.Lock()
+
 
 class MongoDB:
     """MongoDB connection manager"""
-    _client: MongoClient = None
-    _db: Database = None
+    _client: AsyncIOMotorClient = None
+    _db: AsyncIOMotorDatabase = None
     
     @classmethod
-    async def connect(cls) -> Database:
+    async def connect(cls) -> AsyncIOMotorDatabase:
         """
         Connect to MongoDB
-        Returns database instance
+        Returns database instance (reuses existing client if already connected)
         """
-        try:
-            if not env.MONGO_URI:
-                raise ValueError("MONGO_URI environment variable is not defined")
-            
-            cls._client = MongoClient(env.MONGO_URI)
-            
-            # Test connection
-            cls._client.admin.command('ping')
-            
-            # Get database name from URI or use default
-            db_name = env.MONGO_URI.split('/')[-1].split('?')[0] or 'rag_database'
-            cls._db = cls._client[db_name]
-            
-            print('✅ MongoDB connected')
+        if cls._client is not None:
             return cls._db
+        
+        async with _connect_lock:
+            if cls._client is not None:
+                return cls._db
             
-        except Exception as error:
-            print(f'❌ MongoDB connection error: {error}')
-            sys.exit(1)
+            try:
+                if not env.MONGO_URI:
+                    raise ValueError("MONGO_URI environment variable is not defined")
+                
+                # Bounded pool to avoid connection storms
+                client = AsyncIOMotorClient(
+                    env.MONGO_URI,
+                    maxPoolSize=10,
+                    minPoolSize=1,
+                    serverSelectionTimeoutMS=5000,
+                    connectTimeoutMS=5000,
+                    socketTimeoutMS=10000,
+                    waitQueueTimeoutMS=2000,
+                    retryWrites=True,
+                )
+                
+                # Test connection
+                await client.admin.command('ping')
+                
+                # Get database name from URI or use default
+                db_name = env.MONGO_URI.split('/')[-1].split('?')[0] or 'rag_database'
+                cls._client = client
+                cls._db = client[db_name]
+                
+                print('✅ MongoDB connected')
+                return cls._db
+                
+            except Exception as error:
+                print(f'❌ MongoDB connection error: {error}')
+                sys.exit(1)
     
     @classmethod
-    def get_db(cls) -> Database:
+    def get_db(cls) -> AsyncIOMotorDatabase:
         """Get database instance"""
         if cls._db is None:
             raise RuntimeError("Database not connected. Call connect() first.")
@@ -48,10 +69,12 @@ class MongoDB:
         """Close MongoDB connection"""
         if cls._client:
             cls._client.close()
+            cls._client = None
+            cls._db = None
             print('🔌 MongoDB disconnected')
 
 
 # Convenience function matching TypeScript API
-async def connect_db() -> Database:
+async def connect_db() -> AsyncIOMotorDatabase:
     """Connect to MongoDB - matches TypeScript connectDB()"""
     return await MongoDB.connect()
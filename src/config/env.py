@@ -1,51 +1,48 @@
 # config/env.py
 import os
-from typing import Literal
-from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings
+from typing import Annotated, Literal
+import msgspec
 from dotenv import load_dotenv
 
 # Load environment file based on NODE_ENV
 env_file = ".env.production" if os.getenv("NODE_ENV") == "production" else ".env.development"
 load_dotenv(dotenv_path=env_file)
 
+NonEmptyStr = Annotated[str, msgspec.Meta(min_length=1)]
 
-class Settings(BaseSettings):
+
+class Settings(msgspec.Struct, kw_only=True, frozen=True):
     """
     Environment configuration with validation
     Matches TypeScript env.ts schema
     """
-    PORT: int = Field(default=5000, ge=1, le=65535)
+    PORT: Annotated[int, msgspec.Meta(ge=1, le=65535)] = 5000
     
-    MONGO_URI: str = Field(min_length=1)
+    MONGO_URI: NonEmptyStr
     
     NODE_ENV: Literal["development", "production", "test"] = "development"
     
     # 🔒 CRITICAL - Redis connection for BullMQ
-    REDIS_URL: str = Field(min_length=1, description="Redis URL is required for BullMQ")
+    REDIS_URL: NonEmptyStr
     
     # Supabase configuration
-    SUPABASE_URL: str = Field(min_length=1)
-    SUPABASE_SERVICE_ROLE_KEY: str = Field(min_length=1)
+    SUPABASE_URL: NonEmptyStr
+    SUPABASE_SERVICE_ROLE_KEY: NonEmptyStr
     
     # Jina AI API Key (for embeddings)
-    JINA_API_KEY: str = Field(default="", description="Jina AI API key for embeddings")
-    
-    @field_validator('REDIS_URL')
-    @classmethod
-    def validate_redis_url(cls, v: str) -> str:
-        if not v:
-            raise ValueError("REDIS_URL is required")
-        return v
+    JINA_API_KEY: str = ""
     
-    class Config:
-        env_file = env_file
-        case_sensitive = True
+    # PDF parser processes per app worker
+    PDF_WORKERS: Annotated[int, msgspec.Meta(ge=1)] = 1
 
 
 # Singleton instance
 try:
-    env = Settings()
+    env = msgspec.convert(
+        {k: os.environ[k] for k in Settings.__struct_fields__ if k in os.environ},
+        type=Settings,
+        strict=False  # Coerce numeric strings (e.g. PORT)
+    )
     print("✅ Environment variables loaded successfully")
 except Exception as e:
     print(f"❌ Invalid environment variables: {e}")
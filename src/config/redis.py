@@ -1,5 +1,6 @@
 # config/redis.py
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 from src.config.env import env
 import ssl
 
@@ -17,4 +18,17 @@ redis_client = Redis.from_url(
     ssl_cert_reqs=ssl.CERT_NONE if env.REDIS_URL.startswith('rediss://') else None
 )
 
+# Async connection for app-level caching (e.g. embeddings)
+_async_ssl_options = {'ssl_cert_reqs': ssl.CERT_NONE} if env.REDIS_URL.startswith('rediss://') else {}
+redis_async = AsyncRedis.from_url(
+    env.REDIS_URL,
+    decode_responses=False,  # Cached values are raw bytes
+    max_connections=20,
+    socket_keepalive=True,
+    socket_connect_timeout=5,
+    retry_on_timeout=True,
+    health_check_interval=30,
+    **_async_ssl_options
+)
+
 print("✅ Redis client initialized for BullMQ")
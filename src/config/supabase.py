@@ -1,5 +1,7 @@
 # config/supabase.py
 from supabase import create_client, Client
+from postgrest import AsyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
 from src.config.env import env
 
 """
@@ -13,5 +15,15 @@ supabase_admin: Client = create_client(
     env.SUPABASE_SERVICE_ROLE_KEY
 )
 
+# Async PostgREST client for table writes (doesn't block the event loop)
+supabase_db: AsyncPostgrestClient = AsyncPostgrestClient(
+    f"{env.SUPABASE_URL}/rest/v1",
+    headers={
+        **DEFAULT_POSTGREST_CLIENT_HEADERS,
+        "apikey": env.SUPABASE_SERVICE_ROLE_KEY,
+        "Authorization": f"Bearer {env.SUPABASE_SERVICE_ROLE_KEY}",
+    }
+)
+
 
-print('✅ Supabase Admin Client initialized')
\ No newline at end of file
+print('✅ Supabase Admin Client initialized')
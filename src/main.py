@@ -1,23 +1,60 @@
 # main.py – FastAPI RAG Service (replaces BullMQ worker)
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-import uvicorn
 import asyncio
-from typing import Optional
+import gc
+import os
+from typing import Optional, TypedDict
 
 from src.config.db import connect_db, MongoDB
 from src.models.document import DocumentModel
 from src.pipeline.rag_pipeline import process_document_rag
+from src.services.embedder import init_http_client, close_http_client
+from src.services.pdf_extractor import init_pdf_pool, close_pdf_pool
+from src.services.storage import init_storage_client, close_storage_client
 from src.config.env import env
+from src.config.supabase import supabase_db
+from src.config.redis import redis_async
+
+
+# ===================== Lifespan =====================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize database/HTTP connections on startup and clean up on shutdown"""
+    # Collect less often instead of forcing full collections per batch
+    gc.set_threshold(50000, 10, 10)
+    
+    db = await connect_db()
+    app.state.document_model = DocumentModel(db)
+    await DocumentModel.ensure_indexes(db)
+    print("✅ MongoDB connected")
+    await init_http_client()
+    await init_storage_client()
+    init_pdf_pool(env.PDF_WORKERS)
+    print(f"🚀 RAG Service started on port {env.PORT}")
+    
+    yield
+    
+    await close_http_client()
+    await close_storage_client()
+    close_pdf_pool()
+    await supabase_db.aclose()
+    await redis_async.aclose()
+    await MongoDB.close()
+    print("✅ MongoDB closed")
 
 
 # ===================== FastAPI App =====================
 app = FastAPI(
     title="RAG Processing Service",
     description="Python service for RAG pipeline processing",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware (adjust origins as needed)
@@ -42,37 +79,15 @@ class ProcessRequest(BaseModel):
     fileName: str
 
 
-class ProcessResponse(BaseModel):
+class ProcessResponse(TypedDict):
     """
-    Response model matching TypeScript interface
+    Response shape matching TypeScript interface
+    Plain dict (no response validation) serialized with orjson
     """
     success: bool
     pageCount: int
     totalChunks: int
-    error: Optional[str] = None
-
-
-# ===================== Global State =====================
-document_model: DocumentModel | None = None
-
-
-# ===================== Startup/Shutdown Events =====================
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database connection on startup"""
-    global document_model
-    
-    db = await connect_db()
-    document_model = DocumentModel(db)
-    print("✅ MongoDB connected")
-    print(f"🚀 RAG Service started on port {env.PORT}")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up database connection on shutdown"""
-    await MongoDB.close()
-    print("✅ MongoDB closed")
+    error: Optional[str]
 
 
 # ===================== Health Check Endpoint =====================
@@ -83,7 +98,6 @@ async def health_check():
     Health check endpoint for monitoring
     """
     import psutil
-    import os
     
     process = psutil.Process(os.getpid())
     mem = process.memory_info()
@@ -100,23 +114,23 @@ async def health_check():
 
 
 # ===================== Main Processing Endpoint =====================
-@app.post("/process", response_model=ProcessResponse)
-async def process_document(request: ProcessRequest):
+@app.post("/process", response_model=None)
+async def process_document(request: ProcessRequest, http_request: Request) -> ORJSONResponse:
     """
     Main RAG processing endpoint
     
     This endpoint:
     1. Receives job data from Node.js worker
-    2. Updates document status to 'processing'
-    3. Runs the RAG pipeline
-    4. Updates document status to 'processed' or 'failed'
-    5. Returns result
+    2. Runs the RAG pipeline
+    3. Updates document status to 'processed' or 'failed' (single write)
+    4. Returns result
     
     Args:
         request: ProcessRequest with document details
+        http_request: Incoming request (gives access to app.state)
         
     Returns:
-        ProcessResponse with success status and metrics
+        ORJSONResponse with ProcessResponse body (success status and metrics)
         
     Raises:
         HTTPException: If processing fails
@@ -126,17 +140,12 @@ async def process_document(request: ProcessRequest):
     chat_id = request.chatId
     storage_path = request.storagePath
     file_name = request.fileName
+    document_model: DocumentModel = http_request.app.state.document_model
     
     print(f"📥 Processing document: {file_name}")
     
     try:
-        # Mark as processing
-        await document_model.find_by_id_and_update(
-            document_id, 
-            {"status": "processing"}
-        )
-        
-        # Run RAG pipeline
+        # Run RAG pipeline (no interim 'processing' write: nothing polls Mongo mid-run)
         result = await process_document_rag(
             document_id=document_id,
             user_id=user_id,
@@ -159,11 +168,12 @@ async def process_document(request: ProcessRequest):
         
         print(f"✅ Document processed | Pages: {result.page_count}")
         
-        return ProcessResponse(
+        return ORJSONResponse(ProcessResponse(
             success=True,
             pageCount=result.page_count,
             totalChunks=result.total_chunks,
-        )
+            error=None,
+        ))
         
     except Exception as e:
         error_msg = str(e)
@@ -176,20 +186,14 @@ async def process_document(request: ProcessRequest):
         )
         
         # Return error response (don't raise HTTPException to allow retries)
-        return ProcessResponse(
+        return ORJSONResponse(ProcessResponse(
             success=False,
             pageCount=0,
             totalChunks=0,
             error=error_msg,
-        )
+        ))
 
 
 # ===================== Run Server =====================
-if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=env.PORT,
-        reload=False,  # Disable in production
-        log_level="info"
-    )
\ No newline at end of file
+# Production: gunicorn -c gunicorn_conf.py src.main:app
+# (multiple UvicornWorker processes with uvloop + httptools)
@@ -1,46 +1,26 @@
 # models/document.py
-from typing import Literal, Optional
+from typing import Literal, Optional, TypedDict
 from datetime import datetime
 from bson import ObjectId
-from pydantic import BaseModel, Field
-from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
 
 
-class PyObjectId(ObjectId):
-    """Custom ObjectId type for Pydantic"""
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
-    
-    @classmethod
-    def validate(cls, v):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
-
-
-class Document(BaseModel):
+class Document(TypedDict, total=False):
     """
-    Document model matching TypeScript IDocument interface
+    Raw document shape matching TypeScript IDocument interface
+    Plain dict from Mongo (no validation on read)
     """
-    id: Optional[PyObjectId] = Field(default=None, alias="_id")
-    owner_id: PyObjectId = Field(alias="ownerId")
-    chat_id: PyObjectId = Field(alias="chatId")
-    file_name: str = Field(alias="fileName")
-    storage_path: str = Field(alias="storagePath")
+    _id: ObjectId
+    ownerId: ObjectId
+    chatId: ObjectId
+    fileName: str
+    storagePath: str
     size: int
-    status: Literal["uploaded", "processing", "processed", "failed"] = "uploaded"
-    page_count: Optional[int] = Field(default=0, alias="pageCount")
-    created_at: Optional[datetime] = Field(default_factory=datetime.utcnow, alias="createdAt")
-    updated_at: Optional[datetime] = Field(default_factory=datetime.utcnow, alias="updatedAt")
-    
-    class Config:
-        arbitrary_types_allowed = True
-        populate_by_name = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda v: v.isoformat()
-        }
+    status: Literal["uploaded", "processing", "processed", "failed"]
+    pageCount: int
+    createdAt: datetime
+    updatedAt: datetime
 
 
 class DocumentModel:
@@ -49,34 +29,37 @@ class DocumentModel:
     Matches TypeScript DocumentModel functionality
     """
     
-    def __init__(self, db: Database):
+    def __init__(self, db: AsyncIOMotorDatabase):
         self.collection = db['documents']
-        # Create indexes
-        self.collection.create_index("ownerId")
-        self.collection.create_index("chatId")
-        self.collection.create_index("status")
     
-    async def find_by_id_and_update(self, document_id: str, update_data: dict) -> Optional[Document]:
+    @classmethod
+    async def ensure_indexes(cls, db: AsyncIOMotorDatabase) -> None:
+        """Create indexes in a single idempotent round-trip (safe to call from every worker)"""
+        await db['documents'].create_indexes([
+            IndexModel([("ownerId", 1)], background=True),
+            IndexModel([("chatId", 1)], background=True),
+            IndexModel([("status", 1)], background=True),
+        ])
+    
+    async def find_by_id_and_update(self, document_id: str, update_data: dict) -> None:
         """
         Update document by ID
         Matches: DocumentModel.findByIdAndUpdate()
+        
+        The updated document is not fetched back
         """
         try:
-            result = self.collection.find_one_and_update(
+            await self.collection.update_one(
                 {"_id": ObjectId(document_id)},
-                {"$set": {**update_data, "updatedAt": datetime.utcnow()}},
-                return_document=True
+                {"$set": {**update_data, "updatedAt": datetime.utcnow()}}
             )
-            return Document(**result) if result else None
         except Exception as e:
             print(f"❌ Error updating document: {e}")
-            return None
     
-    def find_by_id(self, document_id: str) -> Optional[Document]:
+    async def find_by_id(self, document_id: str) -> Optional[Document]:
         """Find document by ID"""
         try:
-            result = self.collection.find_one({"_id": ObjectId(document_id)})
-            return Document(**result) if result else None
+            return await self.collection.find_one({"_id": ObjectId(document_id)})
         except Exception as e:
             print(f"❌ Error finding document: {e}")
             return None
@@ -1,14 +1,22 @@
 # pipeline/rag_pipeline.py
+import asyncio
 import gc
+import os
 from typing import Dict, List
 from dataclasses import dataclass
 
-from src.config.supabase import supabase_admin
+from src.services.storage import download_pdf_to_file
 from src.services.pdf_extractor import extract_and_process_pdf, PageChunk
 from src.services.embedder import generate_batch_embeddings
 from src.services.vector_store import store_batch_vectors, VectorChunk
 
 
+# Number of embed+store batches allowed in flight at once
+BATCH_CONCURRENCY = 4
+# Chunks per Jina request (amortizes API round-trips)
+BATCH_SIZE = 32
+
+
 @dataclass
 class PipelineResult:
     """Pipeline result matching TypeScript interface"""
@@ -25,17 +33,17 @@ async def process_document_rag(
     storage_path: str
 ) -> PipelineResult:
     """
-    Main RAG Pipeline optimized for low-memory environments
+    Main RAG Pipeline
     
-    MEMORY OPTIMIZATION STRATEGY:
-    1. Download PDF and convert to buffer
-    2. Process in streaming batches (5 chunks at a time)
-    3. Generate embeddings for each batch
-    4. Store vectors immediately
-    5. Clear batch data and trigger GC
-    6. Repeat until complete
+    STRATEGY:
+    1. Stream PDF to a temp file (raw bytes never held in this process)
+    2. Parse the whole PDF in a worker process; all chunks come back at once
+    3. Split chunks into batches (BATCH_SIZE chunks each)
+    4. Generate embeddings and store vectors per batch
+    5. Clear batch data
     
-    This ensures we never hold the entire document + embeddings in memory
+    The semaphore only caps how many embed/store batches run at once
+    (BATCH_CONCURRENCY); the full chunk list is held in memory throughout
     
     Matches TypeScript processDocumentRAG()
     
@@ -51,38 +59,54 @@ async def process_document_rag(
     print(f"🚀 [RAG Pipeline] Starting: {document_id}")
     
     total_chunks_processed = 0
+    sem = asyncio.Semaphore(BATCH_CONCURRENCY)
+    tasks: List[asyncio.Task] = []
+    pdf_path = None
     
     try:
-        # 1. Download PDF from Supabase Storage
-        response = supabase_admin.storage.from_('pdf-uploads').download(storage_path)
+        # 1. Stream PDF from Supabase Storage to a temp file
+        pdf_path = await download_pdf_to_file(storage_path)
         
-        if not response:
+        # 2. Check downloaded size
+        size = os.path.getsize(pdf_path)
+        if not size:
             raise Exception(f"Download failed: No data returned")
-        
-        # 2. Convert to bytes buffer
-        buffer = response
-        print(f"📦 PDF Downloaded. Size: {len(buffer) / 1024 / 1024:.2f} MB")
+        print(f"📦 PDF Downloaded. Size: {size / 1024 / 1024:.2f} MB")
         
         # 3. Define batch processing callback
-        async def handle_batch(chunks: List[PageChunk]) -> None:
+        async def run_batch(chunks: List[PageChunk]) -> None:
             """Process a batch of chunks: Embed -> Store -> Clear"""
             nonlocal total_chunks_processed
             
-            await handle_batch_processing(
-                chunks, document_id, user_id, chat_id
-            )
-            total_chunks_processed += len(chunks)
+            try:
+                await handle_batch_processing(
+                    chunks, document_id, user_id, chat_id
+                )
+                total_chunks_processed += len(chunks)
+            finally:
+                sem.release()
+        
+        async def handle_batch(chunks: List[PageChunk]) -> None:
+            """Schedule a batch once a concurrency slot is free"""
+            await sem.acquire()
+            
+            # Stop the pipeline on the first failed batch (DB/API error)
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception():
+                    sem.release()
+                    raise task.exception()
+            
+            tasks.append(asyncio.create_task(run_batch(chunks)))
         
         # 4. Extract and Process via streaming callback
         result = await extract_and_process_pdf(
-            buffer,
+            pdf_path,
             handle_batch,
-            {'chunkSize': 250, 'overlap': 30}
+            {'chunkSize': 250, 'overlap': 30, 'batchSize': BATCH_SIZE}
         )
         
-        # 5. Final Cleanup
-        del buffer
-        gc.collect()
+        # Wait for in-flight batches
+        await asyncio.gather(*tasks)
         
         print(f"✅ [RAG] Complete: {result['pageCount']} pages, {total_chunks_processed} chunks.")
         
@@ -101,8 +125,19 @@ async def process_document_rag(
             error=str(error)
         )
     finally:
-        # Final GC trigger
-        gc.collect()
+        # Cancel any batches still in flight after a failure, then wait for
+        # them so their exceptions are retrieved
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Remove downloaded PDF
+        if pdf_path and os.path.exists(pdf_path):
+            os.unlink(pdf_path)
+        
+        # Single cheap young-generation pass once the whole pipeline is done
+        gc.collect(0)
 
 
 async def handle_batch_processing(
@@ -115,14 +150,13 @@ async def handle_batch_processing(
     Helper to process a small batch of chunks: Embed -> Store -> Clear
     
     MEMORY OPTIMIZATION:
-    - Only processes 5 chunks at a time
+    - Only processes one batch of chunks at a time
     - Clears intermediate data structures
-    - Triggers garbage collection
     
     Matches TypeScript handleBatchProcessing()
     
     Args:
-        chunks: List of PageChunk objects (max 5)
+        chunks: List of PageChunk objects (max BATCH_SIZE)
         document_id: Document ID
         user_id: User ID
         chat_id: Chat ID
@@ -132,7 +166,7 @@ async def handle_batch_processing(
         texts = [chunk.content for chunk in chunks]
         
         # Generate embeddings via Jina AI
-        embeddings = generate_batch_embeddings(texts)
+        embeddings = await generate_batch_embeddings(texts)
         
         # Map to VectorStore format
         vector_chunks: List[VectorChunk] = [
@@ -158,9 +192,6 @@ async def handle_batch_processing(
         vector_chunks.clear()
         embeddings.clear()
         
-        # Trigger GC
-        gc.collect()
-        
     except Exception as error:
         print(f"  ❌ [Batch Error]: {error}")
         raise  # Re-throw to stop pipeline on DB/API failure
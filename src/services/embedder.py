@@ -1,7 +1,10 @@
 # services/embedder.py
-import requests
-from typing import List
+import hashlib
+from array import array
+import httpx
+from typing import List, Optional
 from src.config.env import env
+from src.config.redis import redis_async
 
 
 class EmbeddingResult:
@@ -11,21 +14,56 @@ class EmbeddingResult:
 
 
 # Jina AI v3 embeddings with 384 dimensions
-JINA_API_URL = "https://api.jina.ai/v1/embeddings"
+JINA_API_BASE_URL = "https://api.jina.ai"
+JINA_EMBEDDINGS_PATH = "/v1/embeddings"
 
+# Embedding cache: sha256(text) -> float32 bytes; key includes model + task + dims
+EMBEDDING_CACHE_PREFIX = b"emb:jina-embeddings-v3:text-matching:384:"
+EMBEDDING_CACHE_TTL = 30 * 24 * 60 * 60  # 30 days
 
-def generate_embedding(text: str) -> EmbeddingResult:
+# Shared HTTP client, created in the FastAPI lifespan. Concurrent batches
+# multiplex over a single HTTP/2 connection; the extra connection slots are
+# only used if the server falls back to HTTP/1.1
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def init_http_client() -> httpx.AsyncClient:
+    """Create the shared Jina HTTP client (reuses existing one if present)"""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=True,
+            base_url=JINA_API_BASE_URL,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=1, max_connections=4),
+            headers={"Authorization": f"Bearer {env.JINA_API_KEY}"}
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared Jina HTTP client"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get shared HTTP client instance"""
+    if _client is None:
+        raise RuntimeError("HTTP client not initialized. Call init_http_client() first.")
+    return _client
+
+
+async def generate_embedding(text: str) -> EmbeddingResult:
     """
     Generate single embedding using Jina AI v3
     Matches TypeScript generateEmbedding()
     """
     try:
-        response = requests.post(
-            JINA_API_URL,
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {env.JINA_API_KEY}"
-            },
+        response = await get_http_client().post(
+            JINA_EMBEDDINGS_PATH,
             json={
                 "model": "jina-embeddings-v3",
                 "task": "text-matching",
@@ -35,7 +73,7 @@ def generate_embedding(text: str) -> EmbeddingResult:
             timeout=30
         )
         
-        if not response.ok:
+        if not response.is_success:
             error_text = response.text
             raise Exception(f"Jina API error: {response.status_code} - {error_text}")
         
@@ -47,42 +85,86 @@ def generate_embedding(text: str) -> EmbeddingResult:
         raise Exception("Embedding generation failed")
 
 
-def generate_batch_embeddings(texts: List[str]) -> List[EmbeddingResult]:
+def _cache_key(text: str) -> bytes:
+    """Redis key for a chunk's embedding"""
+    return EMBEDDING_CACHE_PREFIX + hashlib.sha256(text.encode()).digest()
+
+
+async def _get_cached_embeddings(keys: List[bytes]) -> List[Optional[List[float]]]:
+    """Look up cached embeddings (cache errors count as misses)"""
+    try:
+        values = await redis_async.mget(keys)
+    except Exception as error:
+        print(f"⚠️ [Embedder] Cache read failed: {error}")
+        return [None] * len(keys)
+    
+    return [array('f', value).tolist() if value else None for value in values]
+
+
+async def _set_cached_embeddings(keys: List[bytes], embeddings: List[List[float]]) -> None:
+    """Store embeddings in cache with TTL (best effort)"""
+    try:
+        async with redis_async.pipeline(transaction=False) as pipe:
+            for key, embedding in zip(keys, embeddings):
+                pipe.set(key, array('f', embedding).tobytes(), ex=EMBEDDING_CACHE_TTL)
+            await pipe.execute()
+    except Exception as error:
+        print(f"⚠️ [Embedder] Cache write failed: {error}")
+
+
+async def _fetch_batch_embeddings(texts: List[str]) -> List[List[float]]:
+    """Call Jina AI for a batch of texts"""
+    response = await get_http_client().post(
+        JINA_EMBEDDINGS_PATH,
+        json={
+            "model": "jina-embeddings-v3",
+            "task": "text-matching",
+            "dimensions": 384,
+            "input": texts
+        }
+    )
+    
+    if not response.is_success:
+        error_text = response.text
+        raise Exception(f"Jina API error: {response.status_code} - {error_text}")
+    
+    data = response.json()
+    return [item['embedding'] for item in data['data']]
+
+
+async def generate_batch_embeddings(texts: List[str]) -> List[EmbeddingResult]:
     """
     Generate batch embeddings using Jina AI v3
     Matches TypeScript generateBatchEmbeddings()
     
     MEMORY OPTIMIZATION: Processes in batches to avoid memory spikes
+    
+    Embeddings are cached in Redis by content hash; only cache misses
+    are sent to Jina. Results are returned in input order.
     """
     if not texts:
         return []
     
     try:
-        response = requests.post(
-            JINA_API_URL,
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {env.JINA_API_KEY}"
-            },
-            json={
-                "model": "jina-embeddings-v3",
-                "task": "text-matching",
-                "dimensions": 384,
-                "input": texts
-            },
-            timeout=60
-        )
+        keys = [_cache_key(text) for text in texts]
+        embeddings = await _get_cached_embeddings(keys)
         
-        if not response.ok:
-            error_text = response.text
-            raise Exception(f"Jina API error: {response.status_code} - {error_text}")
+        miss_indexes = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
         
-        data = response.json()
+        if miss_indexes:
+            fetched = await _fetch_batch_embeddings([texts[idx] for idx in miss_indexes])
+            
+            if len(fetched) != len(miss_indexes):
+                raise Exception(
+                    f"Jina API returned {len(fetched)} embeddings for {len(miss_indexes)} inputs"
+                )
+            
+            for idx, embedding in zip(miss_indexes, fetched):
+                embeddings[idx] = embedding
+            
+            await _set_cached_embeddings([keys[idx] for idx in miss_indexes], fetched)
         
-        return [
-            EmbeddingResult(embedding=item['embedding'])
-            for item in data['data']
-        ]
+        return [EmbeddingResult(embedding=embedding) for embedding in embeddings]
         
     except Exception as error:
         print(f"❌ [Embedder] Batch failed: {error}")
@@ -1,115 +1,103 @@
 # services/pdf_extractor.py
-import gc
-import re
-from typing import List, Callable, Awaitable, Dict
-from dataclasses import dataclass
-from pypdf import PdfReader
-import io
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Callable, Awaitable, Dict, Optional, Union
+import msgspec
+from src.services.pdf_parser import parse_pdf
 
 
-@dataclass
-class PageChunk:
+# Worker pool for CPU-bound PDF parsing, created in the FastAPI lifespan.
+# Sized per app worker (Gunicorn already runs one app worker per core), and uses
+# forkserver so children aren't forked from a process running Motor threads + the loop
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+
+class PageChunk(msgspec.Struct, gc=False):
     """Page chunk container matching TypeScript interface"""
     page_number: int
     chunk_index: int
     content: str
 
 
-def clean_text(text: str) -> str:
-    """
-    Clean extracted text
-    Matches TypeScript cleanText()
-    """
-    # Remove extra spaces (preserve newlines)
-    text = re.sub(r'[^\S\r\n]+', ' ', text)
-    # Collapse multiple newlines
-    text = re.sub(r'\n\s*\n', '\n', text)
-    return text.strip()
+def init_pdf_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Create the PDF worker pool (reuses existing one if present)"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("forkserver")
+        )
+    return _pdf_pool
+
+
+def close_pdf_pool() -> None:
+    """Shut down the PDF worker pool (call on app shutdown)"""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """Get PDF worker pool instance"""
+    if _pdf_pool is None:
+        raise RuntimeError("PDF pool not initialized. Call init_pdf_pool() first.")
+    return _pdf_pool
 
 
 async def extract_and_process_pdf(
-    buffer: bytes,
+    source: Union[bytes, str],
     on_batch_ready: Callable[[List[PageChunk]], Awaitable[None]],
     options: Dict[str, int]
 ) -> Dict[str, int]:
     """
-    Extract text and process in batches to stay under memory limits
+    Extract text and process in batches
     
-    MEMORY OPTIMIZATION:
-    - Processes PDF in streaming fashion
-    - Only keeps 5 chunks in memory at a time
-    - Explicitly triggers garbage collection
-    - Clears buffers after use
+    MEMORY BEHAVIOUR:
+    - The whole PDF is parsed in a worker process, which returns every chunk
+      text at once; all PageChunks are then built up front
+    - Peak memory is therefore proportional to the document's extracted text
+      (the raw PDF bytes stay in the worker when a file path is passed)
+    - Chunks are handed to the callback one batch at a time
+    
+    PDF parsing is offloaded to a process pool so it doesn't block the event loop
     
     Matches TypeScript extractAndProcessPdf()
     
     Args:
-        buffer: PDF file as bytes
+        source: PDF file as bytes, or path to a PDF file on disk
         on_batch_ready: Async callback to process chunk batches
-        options: Dictionary with 'chunkSize' and 'overlap'
+        options: Dictionary with 'chunkSize', 'overlap' and optional 'batchSize' (default 5)
     
     Returns:
         Dictionary with 'pageCount'
     """
     try:
-        # 1. Extract raw text using pypdf (lightweight, memory-efficient)
-        pdf_stream = io.BytesIO(buffer)
-        reader = PdfReader(pdf_stream)
-        total_pages = len(reader.pages)
-        
-        # Extract all text
-        full_text = ""
-        for page in reader.pages:
-            full_text += page.extract_text() + "\n"
-        
-        # 2. Clear original buffer immediately to free RAM
-        del buffer
-        pdf_stream.close()
-        gc.collect()
-        
-        # Clean text
-        cleaned_text = clean_text(full_text)
-        del full_text  # Free memory
-        
-        words = cleaned_text.split()
-        del cleaned_text  # Free memory
-        
-        chunks: List[PageChunk] = []
-        chunk_index = 0
         chunk_size = options['chunkSize']
         overlap = options['overlap']
+        batch_size = options.get('batchSize', 5)
+        
+        loop = asyncio.get_running_loop()
+        contents, total_pages = await loop.run_in_executor(
+            get_pdf_pool(), parse_pdf, source, chunk_size, overlap
+        )
         
-        # 3. Sliding window chunking logic
-        i = 0
-        while i < len(words):
-            content = ' '.join(words[i:i + chunk_size])
-            
-            chunks.append(PageChunk(
+        chunks: List[PageChunk] = [
+            PageChunk(
                 page_number=0,  # Not tracking individual pages (same as TS)
                 chunk_index=chunk_index,
                 content=content
-            ))
-            
-            chunk_index += 1
-            
-            # 4. Batch processing: Only keep 5 chunks in memory at a time
-            if len(chunks) >= 5:
-                await on_batch_ready(chunks)
-                chunks.clear()  # Clear list
-                
-                # Manually trigger GC to keep heap low
-                gc.collect()
-            
-            i += (chunk_size - overlap)
+            )
+            for chunk_index, content in enumerate(contents)
+        ]
         
-        # Handle remaining chunks
-        if chunks:
-            await on_batch_ready(chunks)
-            chunks.clear()
+        # 4. Batch processing: hand off one batch at a time
+        for i in range(0, len(chunks), batch_size):
+            await on_batch_ready(chunks[i:i + batch_size])
         
         # Final cleanup
-        del words
-        gc.collect()
+        del chunks, contents
         
         return {'pageCount': total_pages}
         
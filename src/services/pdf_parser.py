@@ -0,0 +1,59 @@
+# services/pdf_parser.py
+# CPU-bound PDF parsing that runs inside the parser worker processes.
+# Keep this module free of config/client imports: every worker imports it.
+import re
+from typing import List, Tuple, Union
+import fitz  # PyMuPDF
+
+
+# Precompiled text-cleaning patterns
+_WHITESPACE_RE = re.compile(r'[^\S\r\n]+')  # Extra spaces (preserve newlines)
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')    # Multiple newlines
+
+
+def clean_text(text: str) -> str:
+    """
+    Clean extracted text
+    Matches TypeScript cleanText()
+    """
+    # Remove extra spaces (preserve newlines), then collapse multiple newlines
+    return _BLANK_LINES_RE.sub('\n', _WHITESPACE_RE.sub(' ', text)).strip()
+
+
+def parse_pdf(source: Union[bytes, str], chunk_size: int, overlap: int) -> Tuple[List[str], int]:
+    """
+    Parse PDF and split into overlapping word chunks (CPU-bound)
+    Runs in a worker process so the event loop stays responsive
+    
+    Args:
+        source: PDF file as bytes, or path to a PDF file on disk
+    
+    Returns:
+        Tuple of (chunk texts, total page count)
+    """
+    # 1. Extract raw text using PyMuPDF (C-backed, much faster than pypdf)
+    if isinstance(source, str):
+        doc = fitz.open(source, filetype="pdf")
+    else:
+        doc = fitz.open(stream=source, filetype="pdf")
+    try:
+        parts = [page.get_text("text") for page in doc]
+        total_pages = doc.page_count
+    finally:
+        doc.close()
+    
+    # 2. Clean text (single join instead of repeated string concatenation)
+    cleaned_text = clean_text("\n".join(parts))
+    del parts  # Free memory
+    
+    words = cleaned_text.split()
+    del cleaned_text  # Free memory
+    
+    # 3. Sliding window chunking logic (chunk starts precomputed from stride)
+    stride = chunk_size - overlap
+    contents = [
+        ' '.join(words[start:start + chunk_size])
+        for start in range(0, len(words), stride)
+    ]
+    
+    return contents, total_pages
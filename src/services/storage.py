@@ -0,0 +1,88 @@
+# services/storage.py
+import asyncio
+import os
+import tempfile
+import httpx
+from typing import Optional
+from src.config.supabase import supabase_admin
+
+
+PDF_BUCKET = 'pdf-uploads'
+# Read size for streamed downloads (1 MB keeps thread hand-offs per write low)
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Shared HTTP client for storage downloads, created in the FastAPI lifespan
+# (kept separate from the Jina client, which carries the Jina API key)
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def init_storage_client() -> httpx.AsyncClient:
+    """Create the shared storage HTTP client (reuses existing one if present)"""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=5.0))
+    return _client
+
+
+async def close_storage_client() -> None:
+    """Close the shared storage HTTP client"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_storage_client() -> httpx.AsyncClient:
+    """Get shared storage HTTP client instance"""
+    if _client is None:
+        raise RuntimeError("Storage client not initialized. Call init_storage_client() first.")
+    return _client
+
+
+async def download_pdf_to_file(storage_path: str) -> str:
+    """
+    Stream a PDF from Supabase Storage into a temporary file
+    
+    MEMORY OPTIMIZATION:
+    - Streams the download in 1 MB chunks instead of buffering the whole file
+    - Returns a file path, so the PDF never has to be held in process memory
+    
+    Caller is responsible for deleting the file when done
+    
+    Args:
+        storage_path: Supabase storage path
+    
+    Returns:
+        Path to the downloaded temporary file
+    """
+    # Signed URL lookup is a small blocking call on the sync client
+    signed = await asyncio.to_thread(
+        supabase_admin.storage.from_(PDF_BUCKET).create_signed_url,
+        storage_path,
+        60
+    )
+    url = (signed.get('signedURL') or signed.get('signedUrl')) if signed else None
+    
+    if not url:
+        raise Exception("Download failed: Could not create signed URL")
+    
+    tmp = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
+    completed = False
+    
+    try:
+        async with get_storage_client().stream('GET', url) as response:
+            if not response.is_success:
+                raise Exception(f"Download failed: {response.status_code}")
+            
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                # Disk write off the event loop
+                await asyncio.to_thread(tmp.write, chunk)
+        
+        completed = True
+        return tmp.name
+        
+    finally:
+        tmp.close()
+        # Also covers cancellation: the caller never gets the path to clean up
+        if not completed:
+            os.unlink(tmp.name)
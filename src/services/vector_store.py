@@ -1,11 +1,11 @@
 # services/vector_store.py
 from typing import List
-from dataclasses import dataclass
-from src.config.supabase import supabase_admin
+import msgspec
+import orjson
+from src.config.supabase import supabase_db
 
 
-@dataclass
-class VectorChunk:
+class VectorChunk(msgspec.Struct, gc=False):
     """Vector chunk container matching TypeScript interface"""
     document_id: str
     user_id: str
@@ -39,16 +39,23 @@ async def store_batch_vectors(chunks: List[VectorChunk]) -> None:
                 'page_number': chunk.page_number,
                 'chunk_index': chunk.chunk_index,
                 'content': chunk.content,
+                # Full precision: halfvec/int8 storage needs a pgvector schema
+                # migration and matching query-side changes first
                 'embedding': chunk.embedding,
             }
             for chunk in chunks
         ]
         
-        # Batch insert
-        response = supabase_admin.table('document_chunks').insert(rows).execute()
+        # Batch insert: serialize once with orjson and post straight to PostgREST;
+        # return=minimal skips echoing the inserted rows back
+        response = await supabase_db.session.post(
+            '/document_chunks',
+            content=orjson.dumps(rows),
+            headers={'Prefer': 'return=minimal'}
+        )
         
-        if hasattr(response, 'error') and response.error:
-            print(f"❌ [VectorStore] Batch insert failed: {response.error}")
+        if not response.is_success:
+            print(f"❌ [VectorStore] Batch insert failed: {response.status_code} - {response.text}")
             raise Exception("Failed to store vectors")
             
     except Exception as error:
@@ -65,7 +72,7 @@ async def delete_document_vectors(document_id: str) -> None:
         document_id: Document ID to delete vectors for
     """
     try:
-        response = supabase_admin.table('document_chunks')\
+        response = await supabase_db.table('document_chunks')\
             .delete()\
             .eq('document_id', document_id)\
             .execute()